@@ -1,6 +1,8 @@
 # auth.py
 import jwt   # <-- comes from PyJWT
+import time
 from datetime import datetime, timedelta
+from functools import lru_cache
 from passlib.context import CryptContext
 
 SECRET_KEY = "mysecret"
@@ -25,11 +27,21 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None):
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)   # PyJWT encode
 
 
+@lru_cache(maxsize=8192)
+def _decode_verified(token: str) -> dict:
+    # only successful decodes are memoized; rejected tokens raise and are not cached
+    return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])   # PyJWT decode
+
+
 def decode_access_token(token: str):
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])   # PyJWT decode
-        return payload
+        payload = _decode_verified(token)
     except jwt.ExpiredSignatureError:
         return None
     except jwt.InvalidTokenError:
         return None
+    # cache hits skip PyJWT's exp validation, so re-check expiry here
+    exp = payload.get("exp")
+    if exp is not None and exp < time.time():
+        return None
+    return dict(payload)
@@ -1,4 +1,5 @@
 # crud.py
+from sqlalchemy import bindparam, exists, select
 from sqlalchemy.orm import Session
 import models, schemas
 from auth import hash_password, verify_password, create_access_token
@@ -6,8 +7,7 @@ from datetime import timedelta
 
 def create_user(db: Session, user_in: schemas.UserCreate):
     # check existing
-    existing = db.query(models.User).filter(models.User.email == user_in.email).first()
-    if existing:
+    if db.query(exists().where(models.User.email == user_in.email)).scalar():
         raise Exception("User with this email already exists")
     hashed = hash_password(user_in.password)
     user = models.User(
@@ -23,8 +23,10 @@ def create_user(db: Session, user_in: schemas.UserCreate):
     # if student or faculty, we must create associated record; caller should pass student/faculty info
     return user
 
+_USER_BY_EMAIL = select(models.User).where(models.User.email == bindparam("email"))
+
 def authenticate_user(db: Session, email: str, password: str):
-    user = db.query(models.User).filter(models.User.email == email).first()
+    user = db.scalars(_USER_BY_EMAIL, {"email": email}).first()
     if not user:
         return None
     if not verify_password(password, user.password_hash):
@@ -81,13 +83,20 @@ def add_timetable_entry(db: Session, tt_in: schemas.TimetableCreate):
     db.refresh(entry)
     return entry
 
+# built once; every call reuses the same statement and its cached compiled form
+_ATTENDANCE_BY_KEY = select(models.Attendance).where(
+    models.Attendance.student_id == bindparam("student_id"),
+    models.Attendance.subject_id == bindparam("subject_id"),
+    models.Attendance.date == bindparam("date")
+)
+
 def mark_attendance(db: Session, att_in: schemas.AttendanceCreate):
     # try to update existing or insert new
-    existing = db.query(models.Attendance).filter(
-        models.Attendance.student_id == att_in.student_id,
-        models.Attendance.subject_id == att_in.subject_id,
-        models.Attendance.date == att_in.date
-    ).first()
+    existing = db.scalars(_ATTENDANCE_BY_KEY, {
+        "student_id": att_in.student_id,
+        "subject_id": att_in.subject_id,
+        "date": att_in.date
+    }).first()
     if existing:
         existing.status = att_in.status
         db.commit()
@@ -8,7 +8,20 @@ load_dotenv()
 DATABASE_URL="mysql+pymysql://root:@localhost:3306/attendance_db"
 
 # echo=True helps during development, set False in production
-engine = create_engine(DATABASE_URL, echo=False, future=True)
+# pre_ping drops connections MySQL closed after wait_timeout; recycle stays under it
+engine = create_engine(
+    DATABASE_URL,
+    echo=False,
+    future=True,
+    # size to workers x threadpool; overflow absorbs bursts beyond the steady-state pool
+    pool_size=int(os.getenv("DB_POOL_SIZE", "20")),
+    max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "40")),
+    pool_timeout=30,
+    pool_pre_ping=True,
+    pool_recycle=1800,
+    # hand out the most recently used connection so light load keeps a small warm set
+    pool_use_lifo=True,
+)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, future=True)
 Base = declarative_base()
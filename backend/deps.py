@@ -1,5 +1,5 @@
 # deps.py
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 from database import SessionLocal
@@ -7,6 +7,7 @@ from models import User, RoleEnum
 from auth import decode_access_token
 from schemas import TokenData
 import typing
+from typing import Annotated
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
 
@@ -17,25 +18,35 @@ def get_db():
     finally:
         db.close()
 
+def get_pagination_params(skip: int = Query(0, ge=0), limit: int = Query(100, ge=1, le=500)):
+    return {"skip": skip, "limit": limit}
+
 def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
-    from auth import decode_access_token
-    from sqlalchemy.exc import NoResultFound
-    try:
-        payload = decode_access_token(token)
-    except Exception as e:
+    # decode_access_token returns None for bad/expired tokens; reject before touching the DB
+    payload = decode_access_token(token)
+    if payload is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired token")
     user_id = payload.get("user_id")
     role = payload.get("role")
     if user_id is None:
         raise HTTPException(status_code=401, detail="Invalid token payload")
-    user = db.query(User).filter(User.user_id == user_id).first()
+    user = db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=401, detail="User not found")
     return user
 
 def require_role(role: str):
+    # resolve the enum member once when the dependency is built, not per request
+    required = RoleEnum(role)
     def role_checker(current_user: User = Depends(get_current_user)):
-        if current_user.role.value != role:
+        if current_user.role != required:
             raise HTTPException(status_code=403, detail=f"Operation allowed only for {role}")
         return current_user
     return role_checker
+
+# shared Annotated dependencies: one require_role callable per role, reused by every route
+DbSession = Annotated[Session, Depends(get_db)]
+Pagination = Annotated[dict, Depends(get_pagination_params)]
+CurrentUser = Annotated[User, Depends(get_current_user)]
+StudentUser = Annotated[User, Depends(require_role("Student"))]
+FacultyUser = Annotated[User, Depends(require_role("Faculty"))]
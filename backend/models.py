@@ -1,5 +1,5 @@
 # models.py
-from sqlalchemy import Column, Integer, String, Enum, ForeignKey, Date, Text, TIMESTAMP, Enum as SAEnum, UniqueConstraint
+from sqlalchemy import Column, Integer, String, Enum, ForeignKey, Date, Text, TIMESTAMP, Enum as SAEnum, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from database import Base
 import enum
@@ -11,7 +11,7 @@ class RoleEnum(str, enum.Enum):
 
 class User(Base):
     __tablename__ = "users"
-    user_id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, primary_key=True)
     name = Column(String(100), nullable=False)
     email = Column(String(100), unique=True, nullable=False, index=True)
     password_hash = Column(String(255), nullable=False)
@@ -46,9 +46,9 @@ class Faculty(Base):
 
 class Subject(Base):
     __tablename__ = "subjects"
-    subject_id = Column(Integer, primary_key=True, index=True)
+    subject_id = Column(Integer, primary_key=True)
     subject_name = Column(String(100), nullable=False)
-    faculty_id = Column(Integer, ForeignKey("faculty.faculty_id", ondelete="SET NULL"), nullable=True)
+    faculty_id = Column(Integer, ForeignKey("faculty.faculty_id", ondelete="SET NULL"), nullable=True, index=True)
     semester = Column(Integer)
 
     faculty = relationship("Faculty", back_populates="subjects")
@@ -57,9 +57,9 @@ class Subject(Base):
 
 class Timetable(Base):
     __tablename__ = "timetable"
-    class_id = Column(Integer, primary_key=True, index=True)
-    subject_id = Column(Integer, ForeignKey("subjects.subject_id", ondelete="CASCADE"))
-    student_id = Column(Integer, ForeignKey("students.student_id", ondelete="CASCADE"))
+    class_id = Column(Integer, primary_key=True)
+    subject_id = Column(Integer, ForeignKey("subjects.subject_id", ondelete="CASCADE"), index=True)
+    student_id = Column(Integer, ForeignKey("students.student_id", ondelete="CASCADE"), index=True)
     day = Column(String(10))  # 'Mon','Tue', etc.
     time_slot = Column(String(30))
 
@@ -68,24 +68,34 @@ class Timetable(Base):
 
 class Attendance(Base):
     __tablename__ = "attendance"
-    attendance_id = Column(Integer, primary_key=True, index=True)
+    attendance_id = Column(Integer, primary_key=True)
     student_id = Column(Integer, ForeignKey("students.student_id", ondelete="CASCADE"))
     subject_id = Column(Integer, ForeignKey("subjects.subject_id", ondelete="CASCADE"))
     date = Column(Date)
-    status = Column(String(10))  # 'Present' or 'Absent'
+    status = Column(String(10))  # 'Present' or 'Absent', validated by schemas.AttendanceCreate
 
-    __table_args__ = (UniqueConstraint('student_id', 'subject_id', 'date', name='u_student_subject_date'),)
+    __table_args__ = (
+        UniqueConstraint('student_id', 'subject_id', 'date', name='u_student_subject_date'),
+        Index('ix_attendance_student_date', 'student_id', 'date'),
+        Index('ix_attendance_subject_date', 'subject_id', 'date'),
+    )
 
     student = relationship("Student", back_populates="attendance")
     subject = relationship("Subject", back_populates="attendance")
 
 class Notification(Base):
     __tablename__ = "notifications"
-    notification_id = Column(Integer, primary_key=True, index=True)
+    notification_id = Column(Integer, primary_key=True)
     title = Column(String(255))
     description = Column(Text)
     created_by = Column(Integer, ForeignKey("faculty.faculty_id", ondelete="CASCADE"))
-    visible_to = Column(String(10), default="All")  # Student|Faculty|All
+    visible_to = Column(String(10), default="All")  # Student|Faculty|All, validated by schemas.NotificationCreate
     created_at = Column(TIMESTAMP, server_default=func.now())
 
+    # serve the role feed and the per-faculty feed, both ORDER BY created_at DESC
+    __table_args__ = (
+        Index('ix_notif_visible_created', 'visible_to', 'created_at'),
+        Index('ix_notif_creator_created', 'created_by', 'created_at'),
+    )
+
     creator = relationship("Faculty", back_populates="notifications")
@@ -1,15 +1,25 @@
 # schemas.py
-from pydantic import BaseModel, EmailStr
+from pydantic import AliasPath, BaseModel, ConfigDict, EmailStr, Field
 from typing import Optional, List
 from datetime import date, datetime
+import enum
+
+class StatusEnum(str, enum.Enum):
+    Present = "Present"
+    Absent = "Absent"
+
+class VisibilityEnum(str, enum.Enum):
+    Student = "Student"
+    Faculty = "Faculty"
+    All = "All"
 
 class Token(BaseModel):
     access_token: str
     token_type: str
 
 class TokenData(BaseModel):
-    user_id: Optional[int]
-    role: Optional[str]
+    user_id: Optional[int] = None
+    role: Optional[str] = None
 
 class UserCreate(BaseModel):
     name: str
@@ -25,18 +35,17 @@ class UserOut(BaseModel):
     role: str
     department: Optional[str] = None
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 class StudentCreate(BaseModel):
     roll_no: str
-    class_name: Optional[str]
-    year: Optional[int]
-    section: Optional[str]
+    class_name: Optional[str] = None
+    year: Optional[int] = None
+    section: Optional[str] = None
 
 class FacultyCreate(BaseModel):
-    designation: Optional[str]
-    dept: Optional[str]
+    designation: Optional[str] = None
+    dept: Optional[str] = None
 
 class SubjectCreate(BaseModel):
     subject_name: str
@@ -53,12 +62,12 @@ class AttendanceCreate(BaseModel):
     student_id: int
     subject_id: int
     date: date
-    status: str
+    status: StatusEnum
 
 class NotificationCreate(BaseModel):
     title: str
     description: str
-    visible_to: str = "Student"  # default to Student
+    visible_to: VisibilityEnum = VisibilityEnum.Student  # default to Student
 
 class NotificationOut(BaseModel):
     notification_id: int
@@ -68,8 +77,7 @@ class NotificationOut(BaseModel):
     visible_to: str
     created_at: datetime
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 class AttendanceOut(BaseModel):
     attendance_id: int
@@ -78,5 +86,30 @@ class AttendanceOut(BaseModel):
     date: date
     status: str
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
+
+class TimetableOut(BaseModel):
+    class_id: int
+    subject_id: Optional[int] = None
+    # read from the joined subject; callers must eager-load Timetable.subject
+    subject_name: Optional[str] = Field(None, validation_alias=AliasPath("subject", "subject_name"))
+    day: Optional[str] = None
+    time_slot: Optional[str] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+class ClassEntryOut(BaseModel):
+    class_id: int
+    student_id: Optional[int] = None
+    day: Optional[str] = None
+    time_slot: Optional[str] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+class FacultyClassOut(BaseModel):
+    subject_id: int
+    subject_name: str
+    semester: Optional[int] = None
+    timetable_entries: List[ClassEntryOut] = []
+
+    model_config = ConfigDict(from_attributes=True)